@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 import uptools
 import os, os.path as osp
@@ -12,3 +13,73 @@ def test_iter_arrays():
     assert len(arrays['genparticles_pt']) == 92
     with pytest.raises((ValueError, KeyError)):
         arrays[b'genparticles_pt']
+
+def test_bunch_mask_length_mismatch():
+    bunch = uptools.Bunch({'x': np.arange(10.), 'y': np.arange(10.)})
+    with pytest.raises(IndexError):
+        bunch[np.ones(3, dtype=bool)]
+
+def test_bunch_lazy_concatenate():
+    bunch = uptools.Bunch({'x': np.arange(5.), 'y': np.arange(5.)})
+    bunch.concatenate({'x': np.arange(5., 8.), 'y': np.arange(5., 8.)})
+    assert bunch._pending  # nothing concatenated until first access
+    np.testing.assert_array_equal(np.asarray(bunch.x), np.arange(8.))
+    assert not bunch._pending
+    assert len(bunch) == 8
+
+def test_bunch_consolidated_selection():
+    x = np.arange(10.)
+    y = np.arange(10) % 3
+    bunch = uptools.Bunch({'x': x, 'y': y})
+    assert bunch._record is not None
+    sel = bunch[x > 4.]
+    assert len(sel) == 5
+    np.testing.assert_array_equal(sel.x, x[x > 4.])
+    np.testing.assert_array_equal(np.asarray(bunch[2:5].y), y[2:5])
+
+def _four_vectors(n=100, seed=1001):
+    rng = np.random.RandomState(seed)
+    pt = rng.uniform(1., 50., n)
+    eta = rng.uniform(-2.5, 2.5, n)
+    phi = rng.uniform(-np.pi, np.pi, n)
+    m = rng.uniform(5., 20., n)
+    energy = np.sqrt(pt**2 * np.cosh(eta)**2 + m**2)
+    return pt, eta, phi, energy, m
+
+def test_fourvectorarray_mass_roundtrip():
+    pt, eta, phi, energy, m = _four_vectors()
+    v = uptools.FourVectorArray(pt, eta, phi, energy)
+    assert len(v) == len(pt)
+    np.testing.assert_allclose(v.px, pt * np.cos(phi))
+    np.testing.assert_allclose(v.py, pt * np.sin(phi))
+    np.testing.assert_allclose(v.pz, pt * np.sinh(eta))
+    np.testing.assert_allclose(v.mass2, m**2)
+    np.testing.assert_allclose(v.mass, m)
+    np.testing.assert_allclose(v.rapidity, np.arctanh(v.pz / energy))
+    for key, value in v.compute_all().items():
+        np.testing.assert_allclose(value, getattr(v, key))
+
+def test_fourvectorarray_negative_mass2_sign():
+    # E < |p|: mass2 goes negative and mass carries the sign
+    v = uptools.FourVectorArray([10.], [0.], [0.], [5.])
+    np.testing.assert_allclose(v.mass2, [-75.])
+    np.testing.assert_allclose(v.mass, [-np.sqrt(75.)])
+
+def test_fourvectorarray_fp32():
+    pt, eta, phi, energy, m = _four_vectors()
+    v = uptools.FourVectorArray(pt, eta, phi, energy, dtype=np.float32)
+    assert v.pt.dtype == np.float32
+    assert v.mass2.dtype == np.float32
+    np.testing.assert_allclose(v.mass, m, rtol=1e-2)
+    promoted = uptools.FourVectorArray(
+        pt, eta, phi, energy, dtype=np.float32, promote_to_fp64_for_mass=True
+    )
+    assert promoted.mass2.dtype == np.float64
+
+def test_fourvectorarray_validation_and_caching():
+    with pytest.raises(ValueError):
+        uptools.FourVectorArray([1., 2.], [0.], [0.], [3.])
+    v = uptools.FourVectorArray([10.], [1.], [0.], [20.])
+    if uptools.cached_property is not property:
+        assert v.px is v.px
+        assert v.mass is v.mass
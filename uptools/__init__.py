@@ -1,4 +1,6 @@
+import functools
 import logging
+import time
 def setup_logger():
     fmt = logging.Formatter(
         fmt="\033[33m[uptools|%(levelname)8s|%(asctime)s|%(module)s]:\033[0m %(message)s",
@@ -34,6 +36,13 @@ except ImportError:
         logger.error('Need some version of uproot installed!')
         raise
 
+import numpy as np
+
+try:
+    from functools import cached_property
+except ImportError:  # python < 3.8
+    cached_property = property
+
 
 UPROOT_VERSION = int(uproot.__version__.split('.',1)[0])
 AK_VERSION = int(ak.__version__.split('.',1)[0])
@@ -48,23 +57,39 @@ def _iter_trees(tdir, prefix=""):
     Takes a ROOTDirectory-like object, and yields trees
     """
     for key, value in tdir.items():
-        try:
-            key = key.decode()
-        except AttributeError:
-            pass
-        key = key.split(";")[0]
+        if isinstance(key, bytes):
+            key = key.decode(errors='replace')
+        key = key.partition(';')[0]
         if hasattr(value, "numentries") or hasattr(value, "num_entries"):
             yield prefix + key, value
         elif hasattr(value, "items"):
             yield from _iter_trees(value, prefix=prefix + key + "/")
 
 
+@functools.lru_cache(maxsize=128)
+def _open_cached(path):
+    """
+    Memoized uproot.open, so repeated metadata lookups on the same path
+    (numentries_rootfile followed by iter_arrays, say) parse the file
+    streamers only once.
+    """
+    return uproot.open(path)
+
+
+@functools.lru_cache(maxsize=128)
+def _find_tree_cached(path):
+    """
+    Memoized (treepath, tree) resolution for a rootfile path.
+    """
+    return find_tree(_open_cached(path))
+
+
 def find_tree(tdir):
     """
     Takes a ROOTDirectory-like object, and finds a tree or raises an Exception
     """
     if isinstance(tdir, str):
-        tdir = uproot.open(tdir)
+        tdir = _open_cached(tdir)
     for path, tree in _iter_trees(tdir):
         logger.info("Using tree %s", path)
         return path, tree
@@ -72,12 +97,54 @@ def find_tree(tdir):
         raise Exception("Could not find any tree-like object in {}".format(tdir))
 
 
+class EventView:
+    """
+    Read-only view of a single event in a dict of columnar arrays.
+    Branches are only sliced upon attribute or item access, so the
+    underlying awkward buffers are never materialized row-wise.
+    """
+    __slots__ = ("_arrays", "_i")
+
+    def __init__(self, arrays, i):
+        self._arrays = arrays
+        self._i = i
+
+    def __getattr__(self, key):
+        try:
+            return self._arrays[key][self._i]
+        except KeyError:
+            raise AttributeError(key)
+
+    def __getitem__(self, key):
+        return self._arrays[key][self._i]
+
+    def keys(self):
+        return self._arrays.keys()
+
+    def to_dict(self):
+        return get_event(self._arrays, self._i)
+
+    def __repr__(self):
+        return "<EventView i={} branches={}>".format(self._i, len(self._arrays))
+
+
 def get_event(arrays, i=0):
-    return {k: v[i] for k, v in arrays.items()}
+    return dict(zip(arrays.keys(), (v[i] for v in arrays.values())))
+
+
+class _Batch(dict):
+    """
+    Plain dict of branch arrays with the batch length attached once, so
+    numentries does not have to iterate the dict per call.
+    """
+    __slots__ = ('n',)
 
 
 def numentries(arrays):
-    for k, v in arrays.items():
+    n = getattr(arrays, 'n', None)
+    if n is not None:
+        return n
+    for v in arrays.values():
         return len(v)
 
 
@@ -85,10 +152,20 @@ def numentries_rootfile(rootfile, treepath=None):
     if treepath is None:
         treepath, tree = find_tree(rootfile)
     else:
-        tree = uproot.open(rootfile)[treepath]
+        tree = _open_cached(rootfile)[treepath]
     return tree.numentries
 
 
+@functools.lru_cache(maxsize=32)
+def _ls_wildcard_cached(expr, _ttl):
+    """
+    Memoized remote wildcard expansion; `_ttl` changes once a minute so
+    the network ls is not re-run within a workflow but does expire.
+    """
+    import seutils
+    return tuple(seutils.ls_wildcard(expr))
+
+
 def format_rootfiles(rootfiles):
     try:
         if rootfiles.endswith(".root"):
@@ -98,7 +175,7 @@ def format_rootfiles(rootfiles):
                 except ImportError:
                     logger.error('Need seutils installed for remote wildcards support: pip install seutils')
                     raise
-                rootfiles = seutils.ls_wildcard(rootfiles)
+                rootfiles = list(_ls_wildcard_cached(rootfiles, int(time.time()) // 60))
             elif '*' in rootfiles:
                 import glob
                 rootfiles = glob.glob(rootfiles)
@@ -110,11 +187,7 @@ def format_rootfiles(rootfiles):
 
 
 def _decode_keys(arrays):
-    try:
-        arrays = { k.decode() : v for k, v in arrays.items() }
-    except AttributeError:
-        pass
-    return arrays
+    return { (k.decode() if isinstance(k, bytes) else k) : v for k, v in arrays.items() }
 
 
 def _convert_high_level_array(arrays):
@@ -126,33 +199,199 @@ def _convert_high_level_array(arrays):
     return arrays
 
 
-def iter_arrays(rootfiles, nmax=None, treepath=None, **kwargs):
+def _make_batch_formatter(first, do_decode):
+    """
+    Builds the batch-formatting function once, based on the first batch of
+    an iteration: the tree shape is fixed within a file, so the per-batch
+    loop should not redo isinstance checks or .fields reflection.
+    """
+    try:
+        is_highlevel = isinstance(first, ak.highlevel.Array)
+    except AttributeError:
+        is_highlevel = False
+    if is_highlevel:
+        fields = tuple(first.fields)
+        def format_batch(arrays):
+            batch = _Batch((k, arrays[k]) for k in fields)
+            batch.n = len(arrays)
+            return batch
+    elif do_decode:
+        def format_batch(arrays):
+            batch = _Batch(_decode_keys(arrays))
+            batch.n = numentries(batch)
+            return batch
+    else:
+        def format_batch(arrays):
+            batch = _Batch(arrays)
+            batch.n = numentries(batch)
+            return batch
+    return format_batch
+
+
+def _prefetch_opens(paths, depth=2):
+    """
+    Yields (path, openfile) pairs, opening up to `depth` files ahead in
+    background threads so (remote) open latency is hidden behind the
+    decompression work on the current file.
+    """
+    import collections
+    from concurrent.futures import ThreadPoolExecutor
+    paths = list(paths)
+    executor = ThreadPoolExecutor(max_workers=depth)
+    try:
+        futures = collections.deque()
+        i_next = 0
+        while futures or i_next < len(paths):
+            while i_next < len(paths) and len(futures) < depth:
+                # The first file is served through _open_cached: treepath
+                # resolution (or an earlier numentries_rootfile call) has
+                # typically opened it already. Look-ahead files get fresh
+                # opens, keeping the handles confined to their thread.
+                opener = _open_cached if i_next == 0 else uproot.open
+                futures.append((paths[i_next], executor.submit(opener, paths[i_next])))
+                i_next += 1
+            path, future = futures.popleft()
+            yield path, future.result()
+    finally:
+        executor.shutdown()
+
+
+def _resolve_treepath(rootfile):
+    """
+    Opens a single rootfile and returns the path of the first tree found.
+    Meant as a first-file probe so multi-file iteration does not pay the
+    tree search (and its extra uproot.open) per file.
+    """
+    if isinstance(rootfile, str):
+        path, _ = _find_tree_cached(rootfile)
+    else:
+        path, _ = find_tree(rootfile)
+    return path
+
+
+def _read_one_file(rootfile, treepath, kwargs):
+    """
+    Reads all array batches from a single rootfile into a list.
+    Runs in a worker process when iter_arrays is given workers>1.
+    """
+    f = uproot.open(rootfile)
+    if treepath is None:
+        treepath, t = find_tree(f)
+    else:
+        t = f[treepath]
+    return list(t.iterate(**kwargs))
+
+
+def _iter_arrays_parallel(rootfiles, nmax, treepath, workers, prefetch, do_decode, kwargs):
+    """
+    File-parallel backend for iter_arrays: decompression is the dominant
+    per-file cost and is trivially parallel across files. Processes are
+    used rather than threads to sidestep uproot thread-safety issues.
+    """
+    import collections
+    from concurrent.futures import ProcessPoolExecutor
+    ntodo = nmax
+    rootfiles = list(rootfiles)
+    if nmax is not None:
+        # No single worker could ever need more than nmax entries of its file
+        kwargs = dict(kwargs)
+        kwargs['entrystop' if UPROOT_VERSION < 4 else 'entry_stop'] = nmax
+    executor = ProcessPoolExecutor(max_workers=workers)
+    futures = collections.deque()
+    try:
+        i_next = 0
+        while futures or i_next < len(rootfiles):
+            while i_next < len(rootfiles) and len(futures) < prefetch * workers:
+                futures.append(executor.submit(_read_one_file, rootfiles[i_next], treepath, kwargs))
+                i_next += 1
+            format_batch = None
+            for arrays in futures.popleft().result():
+                if format_batch is None:
+                    format_batch = _make_batch_formatter(arrays, do_decode)
+                batch = format_batch(arrays)
+                if ntodo is not None:
+                    if batch.n > ntodo:
+                        trimmed = _Batch((b, v[:ntodo]) for b, v in batch.items())
+                        trimmed.n = ntodo
+                        batch = trimmed
+                    ntodo -= batch.n
+                yield batch
+                if ntodo is not None and ntodo <= 0:
+                    return
+    finally:
+        # Drop whatever has not started yet; shutdown only has to wait for
+        # reads that are already running.
+        while futures:
+            futures.popleft().cancel()
+        executor.shutdown()
+
+
+def iter_arrays(
+    rootfiles, nmax=None, treepath=None, workers=1, prefetch=2,
+    executor=None, n_read_threads=None, **kwargs
+    ):
     """
     Yields arrays from (list of) rootfiles.
     Up to a maximum of `nmax` entries are yielded in total.
-    If `treepath` is None, a tree will be automatically searched for
+    If `treepath` is None, a tree will be automatically searched for.
+    Upcoming files are opened `prefetch` deep in background threads while
+    the current file is being iterated, hiding (remote) open latency.
+    Basket reading can be parallelized within uproot by passing an
+    `executor`, or `n_read_threads` to have one ThreadPoolExecutor created
+    up front and reused across all files (uproot3 `executor=`, uproot4
+    `decompression_executor=`).
+    With `workers>1`, files are instead read and decompressed whole in a
+    process pool (at most `prefetch*workers` files in flight, executor
+    options ignored), and batches are yielded in file-submission order.
     """
     do_decode = kwargs.pop('decode', False)
     ntodo = nmax
-    for rootfile in format_rootfiles(rootfiles):
-        f = uproot.open(rootfile)
-        if treepath is None:
-            path, t = find_tree(rootfile)
-            treepath = path.encode()
-        else:
+    rootfiles = format_rootfiles(rootfiles)
+    if isinstance(rootfiles, (str, bytes)):
+        rootfiles = [rootfiles]
+    rootfiles = list(rootfiles)
+    if not rootfiles:
+        # E.g. a wildcard that matched nothing; iterate silently like the
+        # explicit-treepath path always has, rather than crash on [0].
+        logger.warning('No rootfiles to iterate over')
+        return
+    if treepath is None:
+        treepath = _resolve_treepath(rootfiles[0])
+    if workers > 1:
+        yield from _iter_arrays_parallel(
+            rootfiles, nmax, treepath, workers, prefetch, do_decode, kwargs
+        )
+        return
+    if UPROOT_VERSION >= 4 and isinstance(treepath, bytes):
+        treepath = treepath.decode()
+    own_executor = None
+    if executor is None and n_read_threads is not None:
+        from concurrent.futures import ThreadPoolExecutor
+        # Created once and shared across all files, so the thread startup
+        # cost is not paid per file.
+        executor = own_executor = ThreadPoolExecutor(max_workers=n_read_threads)
+    if executor is not None:
+        kwargs['executor' if UPROOT_VERSION < 4 else 'decompression_executor'] = executor
+    try:
+        for rootfile, f in _prefetch_opens(rootfiles, depth=prefetch):
             t = f[treepath]
-        if nmax is None:
-            for arrays in t.iterate(**kwargs):
-                if do_decode: arrays = _decode_keys(arrays)
-                yield _convert_high_level_array(arrays)
-        else:
-            kwargs['entrystop' if UPROOT_VERSION < 4 else 'entry_stop'] = ntodo
-            for arrays in t.iterate(**kwargs):
-                ntodo -= numentries(arrays)
-                if do_decode: arrays = _decode_keys(arrays)
-                yield _convert_high_level_array(arrays)
-                if ntodo <= 0:
+            file_kwargs = kwargs
+            if ntodo is not None:
+                file_kwargs = dict(kwargs)
+                file_kwargs['entrystop' if UPROOT_VERSION < 4 else 'entry_stop'] = ntodo
+            format_batch = None
+            for arrays in t.iterate(**file_kwargs):
+                if format_batch is None:
+                    format_batch = _make_batch_formatter(arrays, do_decode)
+                batch = format_batch(arrays)
+                if ntodo is not None:
+                    ntodo -= batch.n
+                yield batch
+                if ntodo is not None and ntodo <= 0:
                     return
+    finally:
+        if own_executor is not None:
+            own_executor.shutdown()
 
 
 def iter_arrays_weighted(N, crosssections, rootfiles, **kwargs):
@@ -176,9 +415,13 @@ def iter_arrays_weighted(N, crosssections, rootfiles, **kwargs):
 
 
 def iter_events(rootfiles, **kwargs):
+    """
+    Yields one EventView per entry. Views stay columnar under the hood;
+    use .to_dict() on a view if a plain per-event dict is really needed.
+    """
     for arrays in iter_arrays(rootfiles, **kwargs):
         for i in range(numentries(arrays)):
-            yield get_event(arrays, i)
+            yield EventView(arrays, i)
 
 
 def get_event_rootfile(rootfile, i_event, **kwargs):
@@ -188,3 +431,355 @@ def get_event_rootfile(rootfile, i_event, **kwargs):
     for i, event in enumerate(iter_events(rootfile, **kwargs)):
         if i == i_event:
             return event
+
+
+class Bunch:
+    """
+    Container for a dict of branch arrays that share the same event axis.
+    Appended batches are kept in per-branch pending lists and only
+    concatenated (once) when the arrays are actually accessed, so growing
+    a Bunch batch by batch stays O(total length) instead of re-copying
+    the accumulated buffers on every append.
+    """
+
+    @classmethod
+    def from_rootfiles(cls, rootfiles, **kwargs):
+        bunch = cls()
+        for arrays in iter_arrays(rootfiles, **kwargs):
+            bunch.concatenate(arrays)
+        return bunch
+
+    def __init__(self, arrays=None):
+        # Branch keys are normalized to str once here, so attribute and
+        # item access below are single dict lookups with no encode/decode.
+        self.arrays = {} if arrays is None else _decode_keys(arrays)
+        self._pending = {}
+        self._record = self._consolidate()
+
+    def _consolidate(self):
+        """
+        Packs uniform flat numeric branches into a single structured array,
+        so event selections slice one contiguous buffer instead of B dict
+        entries. Jagged or mixed-length content is left as a plain dict.
+        The branch dict is re-pointed at the record columns (views), so all
+        other access paths keep operating on the same memory.
+        """
+        if not self.arrays:
+            return None
+        values = list(self.arrays.values())
+        if not all(
+            isinstance(v, np.ndarray) and v.ndim == 1 and v.dtype.kind in 'biuf'
+            for v in values
+            ):
+            return None
+        n = len(values[0])
+        if any(len(v) != n for v in values[1:]):
+            return None
+        record = np.empty(n, dtype=[(b, v.dtype) for b, v in self.arrays.items()])
+        for b, v in self.arrays.items():
+            record[b] = v
+        self.arrays = {b: record[b] for b in self.arrays}
+        return record
+
+    @classmethod
+    def _from_record(cls, record):
+        new = cls()
+        new._record = record
+        new.arrays = {b: record[b] for b in record.dtype.names}
+        return new
+
+    def concatenate(self, arrays):
+        """
+        Appends a dict of arrays branch by branch; cheap until the next access.
+        """
+        self._record = None
+        for b, v in arrays.items():
+            if isinstance(b, bytes):
+                b = b.decode()
+            if b in self.arrays:
+                self._pending.setdefault(b, []).append(v)
+            else:
+                self.arrays[b] = v
+
+    def _materialize(self):
+        if not self._pending:
+            return
+        for b, chunks in self._pending.items():
+            self.arrays[b] = ak.concatenate([self.arrays[b]] + chunks)
+        self._pending = {}
+
+    def keys(self):
+        return self.arrays.keys()
+
+    def __contains__(self, key):
+        return key in self.arrays
+
+    def __len__(self):
+        self._materialize()
+        return numentries(self.arrays)
+
+    def __getitem__(self, where):
+        self._materialize()
+        if isinstance(where, np.ndarray) and where.dtype == np.bool_ and where.ndim == 1:
+            # Event-level mask: convert to integer indices once here, so
+            # every branch below applies a precomputed take instead of
+            # redoing the mask-to-index conversion internally. The length
+            # validation that boolean indexing used to perform per branch
+            # is hoisted into this single up-front check.
+            if len(where) != len(self):
+                raise IndexError(
+                    'boolean mask length {} does not match number of events {}'.format(
+                        len(where), len(self)
+                        )
+                    )
+            where = np.nonzero(where)[0]
+        if self._record is not None and isinstance(where, (slice, np.ndarray)):
+            # Consolidated storage: one slice of the structured array
+            # instead of B per-branch indexing calls.
+            return type(self)._from_record(self._record[where])
+        return type(self)({b: v[where] for b, v in self.arrays.items()})
+
+    def __getattr__(self, key):
+        if key.startswith('_'):
+            raise AttributeError(key)
+        self._materialize()
+        try:
+            return self.arrays[key]
+        except KeyError:
+            raise AttributeError(key)
+
+    def flatten(self):
+        self._materialize()
+        if AK_VERSION < 1:
+            return type(self)({b: v.flatten() for b, v in self.arrays.items()})
+        return type(self)({b: ak.flatten(v) for b, v in self.arrays.items()})
+
+    def unflatten(self, counts):
+        self._materialize()
+        new = type(self)()
+        if AK_VERSION < 1:
+            # All branches share the same event axis, so compute the
+            # offsets once; fromoffsets skips the cumsum that fromcounts
+            # would redo for every branch.
+            offsets = np.empty(len(counts) + 1, dtype=np.int64)
+            offsets[0] = 0
+            np.cumsum(counts, out=offsets[1:])
+            new.arrays = {b: ak.JaggedArray.fromoffsets(offsets, v) for b, v in self.arrays.items()}
+        else:
+            counts = np.asarray(counts)
+            new.arrays = {b: ak.unflatten(v, counts) for b, v in self.arrays.items()}
+        return new
+
+    def __repr__(self):
+        return "<Bunch {} branches>".format(len(self.arrays))
+
+
+@functools.lru_cache(maxsize=64)
+def _default_branch_map(cls, prefix):
+    """
+    Maps the kinematic attribute names of `cls` to prefixed branch names.
+    The postfixes are class constants, so this is cached per (cls, prefix).
+    """
+    return {k: prefix + postfix for k, postfix in cls.postfixes.items()}
+
+
+class Vectors(Bunch):
+    """
+    Bunch of branches that make up four-vectors sharing a common prefix,
+    e.g. genparticles_pt / genparticles_eta / ...
+    """
+
+    postfixes = {
+        'pt': b'_pt',
+        'eta': b'_eta',
+        'phi': b'_phi',
+        'energy': b'_energy',
+        'mass': b'_mass',
+        }
+
+    @classmethod
+    def from_prefix(cls, prefix, arrays, *branches):
+        """
+        Builds Vectors from the branches in `arrays` starting with `prefix`.
+        Extra non-kinematic branches (e.g. pdgid) can be passed by name,
+        with or without the prefix.
+        """
+        if not isinstance(prefix, bytes):
+            prefix = prefix.encode()
+        branch_map = dict(_default_branch_map(cls, prefix))
+        keys = frozenset(arrays)
+        for b in branches:
+            if not isinstance(b, bytes):
+                b = b.encode()
+            prefixed_b = b'%s_%s' % (prefix, b)
+            if prefixed_b in keys or prefixed_b.decode() in keys:
+                branch_map[b.decode()] = prefixed_b
+            elif b in keys or b.decode() in keys:
+                branch_map[b.decode()] = b
+        vector_arrays = {}
+        for k, v in branch_map.items():
+            if v in keys:
+                vector_arrays[k] = arrays[v]
+            elif v.decode() in keys:
+                vector_arrays[k] = arrays[v.decode()]
+        inst = cls(vector_arrays)
+        inst.prefix = prefix
+        inst._prefix_str = prefix.decode()
+        return inst
+
+    @property
+    def p4(self):
+        """
+        Vectorized TLorentzVectorArray over all entries at once: one ufunc
+        pass per component instead of one TLorentzVector per entry.
+        """
+        try:
+            import uproot_methods
+        except ImportError:
+            logger.error('Need uproot_methods installed for four-vector support')
+            raise
+        self._materialize()
+        return uproot_methods.TLorentzVectorArray.from_ptetaphie(
+            self.pt, self.eta, self.phi, self.energy
+            )
+
+    def as_array(self):
+        return self.p4
+
+    def iter_vectors(self):
+        import warnings
+        warnings.warn(
+            'iter_vectors is deprecated; use .p4 / .as_array() for vectorized access',
+            DeprecationWarning
+            )
+        yield from self.p4
+
+    def iter_vectors_fast(self):
+        """
+        Yields (pt, eta, phi, energy) tuples per vector from a numba kernel
+        that walks the jagged content buffers directly, skipping the
+        per-entry awkward overhead. Falls back to iter_vectors when numba
+        is not installed.
+        """
+        try:
+            from . import _kernels
+        except ImportError:
+            logger.warning('numba not installed; falling back to iter_vectors')
+            yield from self.iter_vectors()
+            return
+        self._materialize()
+        pt, eta, phi, energy = self.pt, self.eta, self.phi, self.energy
+        try:
+            if hasattr(pt, 'content'):
+                # awkward0 JaggedArray accessors
+                starts = np.ascontiguousarray(pt.starts)
+                stops = np.ascontiguousarray(pt.stops)
+                pt, eta, phi, energy = pt.content, eta.content, phi.content, energy.content
+            elif AK_VERSION >= 1 and isinstance(pt, ak.highlevel.Array) and pt.ndim > 1:
+                counts = np.asarray(ak.num(pt))
+                offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+                np.cumsum(counts, out=offsets[1:])
+                starts, stops = offsets[:-1], offsets[1:]
+                pt, eta, phi, energy = (
+                    np.asarray(ak.flatten(v)) for v in (pt, eta, phi, energy)
+                    )
+            else:
+                starts = np.zeros(1, dtype=np.int64)
+                stops = np.full(1, len(pt), dtype=np.int64)
+            args = (
+                np.ascontiguousarray(pt), np.ascontiguousarray(eta),
+                np.ascontiguousarray(phi), np.ascontiguousarray(energy),
+                starts, stops
+                )
+        except Exception:
+            logger.warning('Could not extract flat buffers; falling back to iter_vectors')
+            yield from self.iter_vectors()
+            return
+        yield from _kernels._iter_four(*args)
+
+    def __repr__(self):
+        return "<{} {} branches>".format(
+            getattr(self, '_prefix_str', type(self).__name__), len(self.arrays)
+            )
+
+
+class FourVectorArray:
+    """
+    Four-vector math on flat pt/eta/phi/energy arrays without the
+    uproot_methods dependency. Storage is SoA: four contiguous same-length
+    buffers, with px/py/pz and the derived quantities cached on first
+    access. Derived quantities are
+    written as fused expressions: mass2 uses |p|^2 = pt^2*cosh(eta)^2
+    (since px^2+py^2 = pt^2 and pz = pt*sinh(eta)), so it streams
+    energy/pt/eta through memory once instead of materializing px/py/pz
+    temporaries first.
+
+    Pass dtype=np.float32 to store (and compute) in FP32: ROOT kinematics
+    are usually FP32 on disk anyway, and halving the per-element bytes
+    halves the bandwidth of the memory-bound derived quantities. Beware
+    that mass2 involves a near-cancellation of large terms; set
+    promote_to_fp64_for_mass=True to do just that subtraction in FP64.
+    """
+
+    def __init__(self, pt, eta, phi, energy, dtype=None, promote_to_fp64_for_mass=False):
+        self.pt = np.ascontiguousarray(pt, dtype=dtype)
+        self.eta = np.ascontiguousarray(eta, dtype=dtype)
+        self.phi = np.ascontiguousarray(phi, dtype=dtype)
+        self.energy = np.ascontiguousarray(energy, dtype=dtype)
+        self.promote_to_fp64_for_mass = promote_to_fp64_for_mass
+        if not (self.pt.shape == self.eta.shape == self.phi.shape == self.energy.shape):
+            raise ValueError(
+                'pt/eta/phi/energy shapes do not match: {} {} {} {}'.format(
+                    self.pt.shape, self.eta.shape, self.phi.shape, self.energy.shape
+                    )
+                )
+
+    def __len__(self):
+        return len(self.pt)
+
+    @cached_property
+    def px(self):
+        return self.pt * np.cos(self.phi)
+
+    @cached_property
+    def py(self):
+        return self.pt * np.sin(self.phi)
+
+    @cached_property
+    def pz(self):
+        return self.pt * np.sinh(self.eta)
+
+    @cached_property
+    def mass2(self):
+        energy, pt, eta = self.energy, self.pt, self.eta
+        if self.promote_to_fp64_for_mass and energy.dtype != np.float64:
+            energy = energy.astype(np.float64)
+            pt = pt.astype(np.float64)
+            eta = eta.astype(np.float64)
+        return energy**2 - pt**2 * np.cosh(eta)**2
+
+    @cached_property
+    def mass(self):
+        m2 = self.mass2
+        return np.sign(m2) * np.sqrt(np.abs(m2))
+
+    @cached_property
+    def rapidity(self):
+        pz = self.pz
+        return 0.5 * np.log((self.energy + pz) / (self.energy - pz))
+
+    def compute_all(self):
+        """
+        Computes all derived quantities in one go through the per-instance
+        caches (populating them as a side effect), so repeated access is
+        free and mass2/mass honor promote_to_fp64_for_mass exactly like
+        the property accesses do.
+        """
+        return {
+            'px': self.px,
+            'py': self.py,
+            'pz': self.pz,
+            'mass2': self.mass2,
+            'mass': self.mass,
+            'rapidity': self.rapidity,
+            }
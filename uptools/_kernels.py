@@ -0,0 +1,17 @@
+"""
+Optional numba-compiled helpers. Importing this module requires numba;
+callers are expected to catch the ImportError and fall back to the pure
+python paths.
+"""
+import numba
+
+
+@numba.njit(cache=True)
+def _iter_four(pt, eta, phi, energy, starts, stops):
+    """
+    Walks flat content buffers event by event, yielding one
+    (pt, eta, phi, energy) tuple per vector.
+    """
+    for i in range(len(starts)):
+        for k in range(starts[i], stops[i]):
+            yield pt[k], eta[k], phi[k], energy[k]